@@ -0,0 +1,44 @@
+"""Python hook experiments: decorator, agent-loop, and async variants."""
+
+from .agent_hooks import (
+    AgentHook,
+    AgentMessage,
+    AgentOrchestrator,
+    SimpleAgent,
+    current_message,
+    current_workflow,
+)
+from .async_hooks import (
+    AsyncHookContext,
+    AsyncHookRegistry,
+    AsyncPipeline,
+    AsyncRateLimiter,
+)
+from .decorator_hooks import (
+    ComposableDecorator,
+    HookMetadata,
+    HookPriority,
+    HookRegistry,
+    cache_hook,
+    hook,
+    registry,
+    retry_hook,
+    timing_hook,
+)
+
+
+def install_fast_loop() -> bool:
+    """Opt in to uvloop as the event loop, if it is installed.
+
+    The dispatch-heavy paths here — AsyncPipeline.process_stream,
+    AsyncHookRegistry.trigger(concurrent=True), and
+    AgentOrchestrator.execute_workflow(parallel=True) — spend most of
+    their time in gather/Task machinery, which uvloop implements in C.
+    Returns True if uvloop was installed into the loop policy.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    uvloop.install()
+    return True
@@ -0,0 +1,194 @@
+"""Agent-loop hook experiments.
+
+A small agent abstraction with before/after/error hook points around
+execution, plus an orchestrator that runs agents sequentially or in
+parallel — a Python model of the agent loop the shell hooks in
+../hooks observe from the outside.
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+import uuid
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Task-local context so hooks can read the in-flight message or
+# workflow id without it being threaded through their signatures.
+current_message: ContextVar["AgentMessage"] = ContextVar("current_message")
+current_workflow: ContextVar[str] = ContextVar("current_workflow")
+
+
+@dataclass(slots=True)
+class AgentMessage:
+    """A message passed between agents, carrying its hop history.
+
+    History is an immutable linked chain via ``previous``: extending it
+    on each hop is O(1) instead of copying a growing list.
+    """
+
+    sender: str
+    content: Any
+    metadata: dict = field(default_factory=dict)
+    timestamp: float = field(default_factory=time.time)
+    previous: Optional["AgentMessage"] = None
+
+    def iter_history(self):
+        """Yield prior messages, most recent first, without copying."""
+        node = self.previous
+        while node is not None:
+            yield node
+            node = node.previous
+
+
+def _is_coroutine_callable(hook: Callable) -> bool:
+    """True if calling ``hook`` returns a coroutine (covers callables)."""
+    return asyncio.iscoroutinefunction(hook) or inspect.iscoroutinefunction(
+        getattr(hook, "__call__", hook)
+    )
+
+
+class AgentHook:
+    """Base agent with before/after/error hook points around ``execute``.
+
+    Hooks may be sync or async; awaitability is resolved once at
+    registration so the dispatch loop only branches on a cached bool.
+    """
+
+    __slots__ = ("agent_id", "_pre_hooks", "_post_hooks", "_error_hooks")
+
+    def __init__(self, agent_id: str):
+        self.agent_id = agent_id
+        self._pre_hooks: list[tuple[Callable, bool]] = []
+        self._post_hooks: list[tuple[Callable, bool]] = []
+        self._error_hooks: list[tuple[Callable, bool]] = []
+
+    def before_execution(self, hook: Callable) -> Callable:
+        self._pre_hooks.append((hook, _is_coroutine_callable(hook)))
+        return hook
+
+    def after_execution(self, hook: Callable) -> Callable:
+        self._post_hooks.append((hook, _is_coroutine_callable(hook)))
+        return hook
+
+    def on_error(self, hook: Callable) -> Callable:
+        self._error_hooks.append((hook, _is_coroutine_callable(hook)))
+        return hook
+
+    async def execute(self, message: AgentMessage) -> AgentMessage:
+        """Run pre-hooks, process the message, run post- or error-hooks.
+
+        The message is also published via ``current_message`` for hooks
+        that prefer ``current_message.get()`` over positional args.
+        """
+        token = current_message.set(message)
+        try:
+            for hook, is_coro in self._pre_hooks:
+                if is_coro:
+                    await hook(message)
+                else:
+                    hook(message)
+            result = await self._process(message)
+            for hook, is_coro in self._post_hooks:
+                if is_coro:
+                    await hook(message, result)
+                else:
+                    hook(message, result)
+            return result
+        except Exception as e:
+            for hook, is_coro in self._error_hooks:
+                if is_coro:
+                    await hook(message, e)
+                else:
+                    hook(message, e)
+            raise
+        finally:
+            current_message.reset(token)
+
+    async def _process(self, message: AgentMessage) -> AgentMessage:
+        raise NotImplementedError
+
+
+class SimpleAgent(AgentHook):
+    """Agent that applies a processor callable to the message content."""
+
+    __slots__ = ("_processor", "_processor_is_coro")
+
+    def __init__(self, agent_id: str, processor: Callable):
+        super().__init__(agent_id)
+        self._processor = processor
+        self._processor_is_coro = _is_coroutine_callable(processor)
+
+    async def _process(self, message: AgentMessage) -> AgentMessage:
+        if self._processor_is_coro:
+            content = await self._processor(message.content)
+        else:
+            content = self._processor(message.content)
+        return AgentMessage(
+            sender=self.agent_id,
+            content=content,
+            previous=message,
+        )
+
+
+class AgentOrchestrator:
+    """Run a sequence of registered agents over a message."""
+
+    __slots__ = ("_agents",)
+
+    def __init__(self):
+        self._agents: dict[str, AgentHook] = {}
+
+    def register_agent(self, agent: AgentHook) -> AgentHook:
+        self._agents[agent.agent_id] = agent
+        return agent
+
+    async def execute_workflow(
+        self,
+        initial_message: AgentMessage,
+        agent_sequence: list[str],
+        parallel: bool = False,
+    ) -> list[AgentMessage]:
+        """Chain agents over the message, or fan out in parallel.
+
+        Each run publishes a fresh workflow id via ``current_workflow``.
+        """
+        messages = [initial_message]
+        token = current_workflow.set(uuid.uuid4().hex)
+        try:
+            return await self._run_workflow(
+                messages, initial_message, agent_sequence, parallel
+            )
+        finally:
+            current_workflow.reset(token)
+
+    async def _run_workflow(
+        self,
+        messages: list[AgentMessage],
+        initial_message: AgentMessage,
+        agent_sequence: list[str],
+        parallel: bool,
+    ) -> list[AgentMessage]:
+        if parallel:
+            agents = [self._agents[a] for a in agent_sequence if a in self._agents]
+            if hasattr(asyncio, "TaskGroup"):  # 3.11+
+                async with asyncio.TaskGroup() as tg:
+                    tasks = [tg.create_task(a.execute(initial_message)) for a in agents]
+                messages.extend(t.result() for t in tasks)
+            else:
+                messages.extend(
+                    await asyncio.gather(*(a.execute(initial_message) for a in agents))
+                )
+        else:
+            latest = initial_message
+            for agent_id in agent_sequence:
+                agent = self._agents.get(agent_id)
+                if agent is None:
+                    continue
+                latest = await agent.execute(latest)
+                messages.append(latest)
+        return messages
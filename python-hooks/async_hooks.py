@@ -0,0 +1,247 @@
+"""Async hook experiments.
+
+Async counterparts to decorator_hooks: an event registry with
+pre/main/post phases, a resource context manager with setup/teardown
+hooks, a staged processing pipeline, and a rate-limiting decorator.
+"""
+
+import asyncio
+import functools
+import logging
+from collections import defaultdict
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _compose(f: Callable, g: Callable) -> Callable:
+    """Fuse two sync stages into one callable: x -> g(f(x))."""
+    return lambda x: g(f(x))
+
+
+# Shared result for events nobody subscribed to; tuples so callers
+# cannot mutate the shared instance.
+_EMPTY_RESULT: dict[str, Any] = {"pre": (), "main": (), "post": ()}
+
+
+class AsyncHookRegistry:
+    """Event registry with pre/main/post hook phases, all async."""
+
+    def __init__(self):
+        self._pre_hooks: defaultdict[str, list[Callable]] = defaultdict(list)
+        self._hooks: defaultdict[str, list[Callable]] = defaultdict(list)
+        self._post_hooks: defaultdict[str, list[Callable]] = defaultdict(list)
+
+    def pre(self, event: str) -> Callable:
+        def decorator(func: Callable) -> Callable:
+            self._pre_hooks[event].append(func)
+            return func
+
+        return decorator
+
+    def on(self, event: str) -> Callable:
+        def decorator(func: Callable) -> Callable:
+            self._hooks[event].append(func)
+            return func
+
+        return decorator
+
+    def post(self, event: str) -> Callable:
+        def decorator(func: Callable) -> Callable:
+            self._post_hooks[event].append(func)
+            return func
+
+        return decorator
+
+    async def trigger(
+        self,
+        event: str,
+        *args,
+        concurrent: bool = False,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> dict[str, Any]:
+        """Run pre, main, then post hooks for ``event``."""
+        if not (
+            event in self._pre_hooks
+            or event in self._hooks
+            or event in self._post_hooks
+        ):
+            return _EMPTY_RESULT
+
+        async def run_hooks(hook_list: list[Callable]):
+            if len(hook_list) == 1:
+                # Direct await skips gather's Future/Task machinery for
+                # the common single-subscriber case.
+                coro = hook_list[0](*args, **kwargs)
+                if concurrent and timeout is not None:
+                    return [await asyncio.wait_for(coro, timeout)]
+                return [await coro]
+            if concurrent:
+                if timeout is not None:
+                    # Time out each hook individually so one slow hook
+                    # doesn't cancel everything already completed.
+                    return await asyncio.gather(
+                        *(
+                            asyncio.wait_for(hook(*args, **kwargs), timeout)
+                            for hook in hook_list
+                        )
+                    )
+                return await asyncio.gather(*(hook(*args, **kwargs) for hook in hook_list))
+            return [await hook(*args, **kwargs) for hook in hook_list]
+
+        return {
+            "pre": await run_hooks(self._pre_hooks.get(event, [])),
+            "main": await run_hooks(self._hooks.get(event, [])),
+            "post": await run_hooks(self._post_hooks.get(event, [])),
+        }
+
+
+class AsyncHookContext:
+    """Async context manager running setup hooks on enter, teardown on exit.
+
+    Hooks receive the shared ``resources`` dict; teardown runs in
+    reverse registration order, like nested context managers.
+    ``parallel_teardown=True`` fans independent teardowns out through
+    asyncio.gather, so exit latency is the slowest hook rather than
+    the sum of all of them.
+    """
+
+    __slots__ = ("_setup_hooks", "_teardown_hooks", "_resources", "parallel_teardown")
+
+    def __init__(self, parallel_teardown: bool = False):
+        self._setup_hooks: list[Callable] = []
+        self._teardown_hooks: list[Callable] = []
+        self._resources: dict[str, Any] = {}
+        self.parallel_teardown = parallel_teardown
+
+    def on_setup(self, hook: Callable) -> Callable:
+        self._setup_hooks.append(hook)
+        return hook
+
+    def on_teardown(self, hook: Callable) -> Callable:
+        self._teardown_hooks.append(hook)
+        return hook
+
+    async def __aenter__(self) -> dict[str, Any]:
+        for hook in self._setup_hooks:
+            await hook(self._resources)
+        return self._resources
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        if self.parallel_teardown:
+            await asyncio.gather(
+                *(hook(self._resources) for hook in reversed(self._teardown_hooks)),
+                return_exceptions=True,
+            )
+        else:
+            for hook in reversed(self._teardown_hooks):
+                await hook(self._resources)
+        return False
+
+
+class AsyncPipeline:
+    """Run data through a chain of sync or async stages.
+
+    Stage awaitability is resolved once in add_stage, and adjacent sync
+    stages are fused into a single composed callable, so process pays
+    one frame per fused stage rather than per added stage.
+    """
+
+    __slots__ = ("_stages", "_finalized_run")
+
+    def __init__(self):
+        self._stages: list[tuple[Callable, bool]] = []
+        self._finalized_run: Optional[Callable] = None
+
+    def add_stage(self, stage: Callable) -> "AsyncPipeline":
+        if self._finalized_run is not None:
+            raise RuntimeError("pipeline is finalized; add stages before finalize()")
+        is_coro = asyncio.iscoroutinefunction(stage)
+        if not is_coro and self._stages and not self._stages[-1][1]:
+            prev = self._stages[-1][0]
+            self._stages[-1] = (_compose(prev, stage), False)
+        else:
+            self._stages.append((stage, is_coro))
+        return self
+
+    def finalize(self) -> "AsyncPipeline":
+        """Snapshot the stages into a specialized runner closure.
+
+        For a fixed pipeline called in a tight loop this removes the
+        per-call stage-list attribute read and the fully-sync check;
+        the runner iterates a tuple captured in its closure. Stages
+        can no longer be added afterwards.
+        """
+        stages = tuple(self._stages)
+        if len(stages) == 1 and not stages[0][1]:
+            fused = stages[0][0]
+
+            async def _run(data: Any) -> Any:
+                return fused(data)
+
+        else:
+
+            async def _run(data: Any) -> Any:
+                for stage, is_coro in stages:
+                    data = await stage(data) if is_coro else stage(data)
+                return data
+
+        self._finalized_run = _run
+        return self
+
+    async def process(self, data: Any) -> Any:
+        if self._finalized_run is not None:
+            return await self._finalized_run(data)
+        stages = self._stages
+        if len(stages) == 1 and not stages[0][1]:
+            # A fully-sync pipeline fuses to one callable: single call,
+            # no stage loop, no intermediate awaits.
+            return stages[0][0](data)
+        current_data = data
+        for stage, is_coro in stages:
+            if is_coro:
+                current_data = await stage(current_data)
+            else:
+                current_data = stage(current_data)
+        return current_data
+
+    async def process_stream(self, items: list[Any]) -> list[Any]:
+        return await asyncio.gather(*(self.process(item) for item in items))
+
+
+class AsyncRateLimiter:
+    """Decorator limiting calls to ``max_calls`` per ``period`` seconds.
+
+    Token bucket tracked as a single "zero time" — the loop instant at
+    which the bucket would be empty — refilled at max_calls / period
+    tokens per second with a burst of max_calls. Acquiring a token is
+    a few arithmetic ops instead of scanning a timestamp window, and
+    the bookkeeping never yields between read and write, so under
+    asyncio's single-threaded scheduling no lock is needed.
+    """
+
+    __slots__ = ("max_calls", "period", "_rate", "_zero_time")
+
+    def __init__(self, max_calls: int, period: float = 1.0):
+        self.max_calls = max_calls
+        self.period = period
+        self._rate = max_calls / period
+        self._zero_time = 0.0
+
+    def __call__(self, func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            loop = asyncio.get_running_loop()
+            while True:
+                now = loop.time()
+                tokens = min((now - self._zero_time) * self._rate, float(self.max_calls))
+                if tokens >= 1.0:
+                    self._zero_time = now - (tokens - 1.0) / self._rate
+                    break
+                # Not enough tokens; sleep until one accrues and re-check,
+                # since other waiters may have drained the bucket meanwhile.
+                await asyncio.sleep((1.0 - tokens) / self._rate)
+            return await func(*args, **kwargs)
+
+        return wrapper
@@ -0,0 +1,307 @@
+"""Decorator-based hook experiments.
+
+Python mirrors of the shell hook ideas in ../hooks: observe calls
+(timing), short-circuit them (cache), recover from failures (retry),
+and a priority-ordered registry for named hooks triggered by event,
+in the spirit of Cursor's hook events.
+"""
+
+import asyncio
+import functools
+import logging
+import random
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from enum import Enum
+from functools import _make_key  # the C-implemented key builder lru_cache uses
+from typing import Any, Callable, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+def timing_hook(func: Callable) -> Callable:
+    """Log how long each call to ``func`` takes."""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.monotonic_ns()
+        result = func(*args, **kwargs)
+        elapsed_ns = time.monotonic_ns() - start
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("%s took %.4fs", func.__name__, elapsed_ns / 1e9)
+        return result
+
+    return wrapper
+
+
+def cache_hook(ttl: float = 60.0, max_size: int = 1024) -> Callable:
+    """Cache results of the decorated function for ``ttl`` seconds.
+
+    Keeps at most ``max_size`` entries, evicting least-recently-used.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        cache: OrderedDict[Any, tuple[Any, int]] = OrderedDict()
+        ttl_ns = int(ttl * 1e9)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = _make_key(args, kwargs, typed=False)
+            now = time.monotonic_ns()
+            entry = cache.get(key)
+            if entry is not None:
+                result, timestamp = entry
+                if now - timestamp < ttl_ns:
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("cache hit for %s", func.__name__)
+                    cache.move_to_end(key)
+                    return result
+            result = func(*args, **kwargs)
+            cache[key] = (result, now)
+            cache.move_to_end(key)
+            if len(cache) > max_size:
+                cache.popitem(last=False)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def retry_hook(max_attempts: int = 3, delay: float = 1.0) -> Callable:
+    """Retry the decorated function with exponential backoff and jitter.
+
+    Waits ``delay * 2**attempt`` plus up to ``delay / 2`` of random
+    jitter between tries. Coroutine functions get an async wrapper
+    that sleeps on the event loop instead of blocking it; the check
+    happens once at decoration time.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        def backoff(attempt: int) -> float:
+            return delay * 2**attempt + random.uniform(0, delay / 2)
+
+        if asyncio.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                last_exception: Optional[Exception] = None
+                for attempt in range(max_attempts):
+                    try:
+                        return await func(*args, **kwargs)
+                    except Exception as e:
+                        last_exception = e
+                        logger.warning(
+                            "%s attempt %d failed: %s", func.__name__, attempt + 1, e
+                        )
+                        if attempt < max_attempts - 1:
+                            await asyncio.sleep(backoff(attempt))
+                raise last_exception
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            last_exception: Optional[Exception] = None
+            for attempt in range(max_attempts):
+                try:
+                    return func(*args, **kwargs)
+                except Exception as e:
+                    last_exception = e
+                    logger.warning(
+                        "%s attempt %d failed: %s", func.__name__, attempt + 1, e
+                    )
+                    if attempt < max_attempts - 1:
+                        time.sleep(backoff(attempt))
+            raise last_exception
+
+        return wrapper
+
+    return decorator
+
+
+class HookPriority(Enum):
+    """Execution priority for registered hooks (higher runs first)."""
+
+    LOWEST = 0
+    LOW = 1
+    NORMAL = 2
+    HIGH = 3
+    HIGHEST = 4
+
+
+# Shared result for events with no enabled hooks; a tuple so callers
+# cannot mutate the shared instance.
+_NO_RESULTS: tuple = ()
+
+
+@dataclass(slots=True)
+class HookMetadata:
+    """Bookkeeping for a registered hook."""
+
+    name: str
+    func: Callable
+    priority: HookPriority = HookPriority.NORMAL
+    enabled: bool = True
+
+
+class HookRegistry:
+    """Priority-ordered registry of named hooks, triggered by event name.
+
+    Hooks registered without an event are "global" and fire on every
+    trigger, before the event's own hooks.
+    """
+
+    def __init__(self):
+        # One bucket per HookPriority value; trigger walks them highest-first,
+        # so registration is an O(1) append instead of a sort.
+        self._hooks: dict[str, list[list[HookMetadata]]] = {}
+        self._global_hooks: list[list[HookMetadata]] = [[] for _ in HookPriority]
+        # Per-event snapshot of (func, name) for enabled hooks in dispatch
+        # order, built lazily on first trigger and invalidated on any
+        # registration or enable/disable.
+        self._compiled: dict[str, list[tuple[Callable, str]]] = {}
+        # Name -> metadata index so enable/disable touch only matching
+        # hooks instead of scanning every bucket.
+        self._by_name: defaultdict[str, list[HookMetadata]] = defaultdict(list)
+
+    def register(
+        self,
+        event: Optional[str] = None,
+        priority: HookPriority = HookPriority.NORMAL,
+        name: Optional[str] = None,
+    ) -> Callable:
+        """Decorator registering a hook for ``event`` (or globally)."""
+
+        def decorator(func: Callable) -> Callable:
+            hook_name = name or func.__name__
+            metadata = HookMetadata(name=hook_name, func=func, priority=priority)
+            self._by_name[hook_name].append(metadata)
+            if event is None:
+                self._global_hooks[priority.value].append(metadata)
+                self._compiled.clear()
+            else:
+                buckets = self._hooks.setdefault(event, [[] for _ in HookPriority])
+                buckets[priority.value].append(metadata)
+                self._compiled.pop(event, None)
+            return func
+
+        return decorator
+
+    def _iter_hooks(self, event: str):
+        """Yield global hooks then the event's hooks, highest priority first."""
+        for bucket in reversed(self._global_hooks):
+            yield from bucket
+        buckets = self._hooks.get(event)
+        if buckets is not None:
+            for bucket in reversed(buckets):
+                yield from bucket
+
+    def trigger(self, event: str, *args, **kwargs) -> Sequence[Any]:
+        """Run global hooks then the event's hooks, collecting results."""
+        compiled = self._compiled.get(event)
+        if compiled is None:
+            compiled = [(h.func, h.name) for h in self._iter_hooks(event) if h.enabled]
+            self._compiled[event] = compiled
+        if not compiled:
+            return _NO_RESULTS
+        if len(compiled) == 1:
+            func, hook_name = compiled[0]
+            try:
+                return [func(*args, **kwargs)]
+            except Exception as e:
+                logger.error(f"hook {hook_name} failed on {event}: {e}")
+                return []
+        results = []
+        for func, hook_name in compiled:
+            try:
+                results.append(func(*args, **kwargs))
+            except Exception as e:
+                logger.error(f"hook {hook_name} failed on {event}: {e}")
+        return results
+
+    def set_enabled(self, name: str, enabled: bool) -> None:
+        for metadata in self._by_name.get(name, ()):
+            metadata.enabled = enabled
+        self._compiled.clear()
+
+    def enable_hook(self, name: str) -> None:
+        self.set_enabled(name, True)
+
+    def disable_hook(self, name: str) -> None:
+        self.set_enabled(name, False)
+
+
+class ComposableDecorator:
+    """Build a decorator from chained conditions and result transformations.
+
+    Conditions gate the call (returning ``None`` when any fails);
+    transformations are applied to the result in order.
+    """
+
+    __slots__ = ("_conditions", "_transformations")
+
+    def __init__(self):
+        self._conditions: list[Callable[..., bool]] = []
+        self._transformations: list[Callable] = []
+
+    def when(self, condition: Callable[..., bool]) -> "ComposableDecorator":
+        self._conditions.append(condition)
+        return self
+
+    def transform(self, transformation: Callable) -> "ComposableDecorator":
+        self._transformations.append(transformation)
+        return self
+
+    def _wrap(self, func: Callable) -> Callable:
+        # Snapshot the chains and pick the narrowest wrapper, so the
+        # per-call body does no self lookups and no empty-loop passes.
+        # Conditions/transforms added after wrapping don't affect
+        # already-decorated functions.
+        conds = tuple(self._conditions)
+        trans = tuple(self._transformations)
+
+        if not conds and not trans:
+            return func
+
+        if not trans:
+
+            @functools.wraps(func)
+            def cond_wrapper(*args, **kwargs):
+                for condition in conds:
+                    if not condition(*args, **kwargs):
+                        return None
+                return func(*args, **kwargs)
+
+            return cond_wrapper
+
+        if not conds:
+
+            @functools.wraps(func)
+            def trans_wrapper(*args, **kwargs):
+                result = func(*args, **kwargs)
+                for transformation in trans:
+                    result = transformation(result)
+                return result
+
+            return trans_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            for condition in conds:
+                if not condition(*args, **kwargs):
+                    return None
+            result = func(*args, **kwargs)
+            for transformation in trans:
+                result = transformation(result)
+            return result
+
+        return wrapper
+
+    def __call__(self, func: Callable) -> Callable:
+        return self._wrap(func)
+
+
+registry = HookRegistry()
+hook = registry.register